@@ -1,4 +1,5 @@
 import os
+from typing import Callable
 
 from .container import CONTAINER_TYPES
 from .data import ObjectData, ObjectDataFactory
@@ -30,6 +31,10 @@ class KeyColumn(TreeColumn):
 
     def __init__(self, icon_renderer:SVGIconRenderer) -> None:
         self._icon_renderer = icon_renderer
+        self._icon_listener = None  # Called with each item whose icon finishes rendering after it was formatted.
+
+    def set_icon_listener(self, listener:Callable[[TreeItem], None]) -> None:
+        self._icon_listener = listener
 
     def _format_item(self, item:TreeItem, data:ObjectData) -> None:
         item.set_color(*data.color)
@@ -40,7 +45,7 @@ class KeyColumn(TreeColumn):
         item.set_children(data.children)
         icon_xml = data.icon_data
         if icon_xml:
-            icon = self._icon_renderer.render(icon_xml)
+            icon = self._icon_renderer.render(icon_xml, item.icon_setter(self._icon_listener))
             item.set_icon(icon)
 
 
@@ -79,7 +84,9 @@ def build_model(root_data:ObjectData) -> TreeItemModel:
     type_col = TypeColumn()
     value_col = ValueColumn()
     root_item = key_col.generate_item(root_data)
-    return TreeItemModel(root_item, [key_col, type_col, value_col])
+    model = TreeItemModel(root_item, [key_col, type_col, value_col])
+    key_col.set_icon_listener(model.refresh_icon)
+    return model
 
 
 class NamespaceTreeDialog(TreeDialog):
@@ -1,69 +1,195 @@
 """ Qt GUI implementation. """
 
-from collections import defaultdict
+from collections import OrderedDict
+from hashlib import blake2b
 from itertools import islice
-from typing import Any, Callable, Collection, Iterator, Sequence, TypeVar, Union, DefaultDict, Generic
+from threading import Lock
+from typing import Any, Callable, Collection, Iterator, Sequence, TypeVar, Union, Generic
 
-from PySide6.QtCore import QAbstractItemModel, QModelIndex, QPersistentModelIndex, QSize, Qt
-from PySide6.QtGui import QColor, QFont, QIcon, QImage, QPainter, QPixmap
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, QObject, QPersistentModelIndex, QRunnable, QSize, Qt, \
+    QThreadPool, Signal, SignalInstance
+from PySide6.QtGui import QColor, QFont, QIcon, QImage, QPainter, QPixmap, QPixmapCache
 from PySide6.QtSvg import QSvgRenderer
 from PySide6.QtWidgets import QDialog, QTreeView, QVBoxLayout
 
 TreeItemDataT = TypeVar("TreeItemDataT")  # Type parameter for row data payloads.
 
+# Tree items only ever hold data for these Qt roles. Each has a fixed slot in the item's role list.
+_DISPLAY_SLOT, _FOREGROUND_SLOT, _TOOLTIP_SLOT, _DECORATION_SLOT = range(4)
+_ROLE_SLOT = {int(Qt.ItemDataRole.DisplayRole): _DISPLAY_SLOT,
+              int(Qt.ItemDataRole.ForegroundRole): _FOREGROUND_SLOT,
+              int(Qt.ItemDataRole.ToolTipRole): _TOOLTIP_SLOT,
+              int(Qt.ItemDataRole.DecorationRole): _DECORATION_SLOT}
+_EMPTY_ROLES = (None,) * len(_ROLE_SLOT)
 
-class SVGIconRenderer:
-    """ Renders SVG bytes data on bitmap images to create QIcons and caches the results. """
+# Item text colors come from a tiny palette, so each distinct color is only created once and shared.
+# Black is the default and red marks failed edits; any others are added on first use.
+_COLOR_CACHE: dict[tuple[int, int, int], QColor] = {rgb: QColor(*rgb) for rgb in [(0, 0, 0), (192, 0, 0)]}
+
+
+class _SVGRenderTask(QRunnable):
+    """ Pool task that parses and rasterizes one SVG image away from the GUI thread. """
+
+    def __init__(self, key:str, data:bytes, render_image:Callable[[str, bytes], QImage], finished:SignalInstance) -> None:
+        super().__init__()
+        self._key = key                    # Cache key of the icon being rendered.
+        self._data = data                  # Raw SVG XML data.
+        self._render_image = render_image  # Thread-safe function to draw the XML data on a new image.
+        self._finished = finished          # Signal to deliver the finished image back to the GUI thread.
+
+    def run(self) -> None:
+        self._finished.emit(self._key, self._render_image(self._key, self._data))
+
+
+class SVGIconRenderer(QObject):
+    """ Renders SVG bytes data on bitmap images to create QIcons and caches the results.
+        Rendering happens on the global thread pool; icons not yet cached are delivered by callback. """
 
     XMLIconData = Union[bytes, bytearray, str]    # Valid input data types for QSvgRenderer.
     TRANSPARENT_COLOR = QColor(255, 255, 255, 0)  # Transparent white default background color.
+    PLACEHOLDER_ICON = QIcon()                    # Blank icon shown while the real one is rendering.
 
     # Icons are small but important. Use these render hints by default for best quality.
     _HQ_RENDER_HINTS = (QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
 
-    def __init__(self, bg_color=TRANSPARENT_COLOR, *, render_hints=_HQ_RENDER_HINTS) -> None:
+    _sig_finished = Signal(str, QImage)  # Sent from pool threads with the cache key and image of a finished render.
+
+    def __init__(self, bg_color=TRANSPARENT_COLOR, *, render_hints=_HQ_RENDER_HINTS, cache_limit_kb=20480,
+                 max_parsed=256) -> None:
+        super().__init__()
         self._bg_color = bg_color          # Background color for icons (transparent by default).
         self._render_hints = render_hints  # Render quality hints for the SVG painter/renderer.
-        self._cache = {}                   # Cache of icons already rendered, keyed by the XML data that generated it.
-
-    def render(self, data:XMLIconData) -> QIcon:
-        """ If we have the SVG rendered, return the icon from the cache. Otherwise, render and cache it first. """
-        if data not in self._cache:
-            self._cache[data] = self._render(data)
-        return self._cache[data]
-
-    def _render(self, data:XMLIconData) -> QIcon:
-        """ Create a template image, render the XML data in place, and convert it to an icon.
-            Use the viewbox dimensions as pixel sizes. """
+        self._pending: dict[str, list[Callable[[QIcon], None]]] = {}  # Callbacks waiting on each in-flight render.
+        self._img_pool: dict[tuple[int, int], list[QImage]] = {}  # Template images not in use, keyed by (width, height).
+        self._img_lock = Lock()            # Guards the template pool, which is shared by all pool threads.
+        self._svg_cache: OrderedDict[str, QSvgRenderer] = OrderedDict()  # LRU cache of parsed SVG data by cache key.
+        self._svg_max = max_parsed         # Maximum number of parsed SVG renderers to keep.
+        self._svg_lock = Lock()            # Guards the parsed SVG cache, which is shared by all pool threads.
+        # Rendered pixmaps go in Qt's process-global cache, keyed by a digest of their XML data.
+        # Only ever raise its size limit; other users of the cache may have asked for more.
+        if QPixmapCache.cacheLimit() < cache_limit_kb:
+            QPixmapCache.setCacheLimit(cache_limit_kb)
+        self._sig_finished.connect(self._finish, Qt.ConnectionType.QueuedConnection)
+
+    def render(self, data:XMLIconData, callback:Callable[[QIcon], None] = None) -> QIcon:
+        """ If we have the SVG rendered, return the icon from the cache. Otherwise, return a placeholder
+            and start rendering it on the thread pool; <callback> will be called with the real icon when done.
+            str and bytes forms of the same XML share one entry. """
         if isinstance(data, str):
             data = data.encode('utf-8')
+        key = 'svgicon:' + blake2b(data).hexdigest()
+        pixmap = QPixmap()
+        if QPixmapCache.find(key, pixmap):
+            return QIcon(pixmap)
+        callbacks = self._pending.get(key)
+        if callbacks is None:
+            # Only the first request for an icon starts a render. Later ones just wait on it.
+            callbacks = self._pending[key] = []
+            task = _SVGRenderTask(key, bytes(data), self._render_image, self._sig_finished)
+            QThreadPool.globalInstance().start(task)
+        if callback is not None:
+            callbacks.append(callback)
+        return self.PLACEHOLDER_ICON
+
+    def _finish(self, key:str, im:QImage) -> None:
+        """ Cache a finished image as a pixmap and hand icons to everything that was waiting for it.
+            QPixmap may only be used on the GUI thread, so this part can't happen in the pool. """
+        pixmap = QPixmap.fromImage(im)
+        QPixmapCache.insert(key, pixmap)
+        icon = QIcon(pixmap)
+        for callback in self._pending.pop(key, ()):
+            callback(icon)
+
+    def _take_template(self, size:QSize) -> QImage:
+        """ Take a template image with the given <size> out of the pool, or allocate one if none are free.
+            No other thread may use it until it is put back. """
+        with self._img_lock:
+            free = self._img_pool.get((size.width(), size.height()))
+            if free:
+                return free.pop()
+        return QImage(size, QImage.Format.Format_ARGB32)
+
+    def _put_template(self, tpl:QImage) -> None:
+        """ Return a template image to the pool once we're done with it. """
+        with self._img_lock:
+            self._img_pool.setdefault((tpl.width(), tpl.height()), []).append(tpl)
+
+    def _parse(self, key:str, data:bytes) -> QSvgRenderer:
+        """ Return a parsed SVG renderer for <data>, reusing a previous parse with the same <key> if possible.
+            Keeping these separately means an evicted pixmap can be redrawn without parsing the XML again. """
+        with self._svg_lock:
+            svg = self._svg_cache.get(key)
+            if svg is not None:
+                self._svg_cache.move_to_end(key)
+                return svg
+        # Parsing is the expensive part, so other threads may use the cache in the meantime.
         svg = QSvgRenderer(data)
-        viewbox = svg.viewBox().size()
-        im = QImage(viewbox, QImage.Format.Format_ARGB32)
-        im.fill(self._bg_color)
-        with QPainter(im) as p:
+        with self._svg_lock:
+            self._svg_cache[key] = svg
+            if len(self._svg_cache) > self._svg_max:
+                self._svg_cache.popitem(last=False)
+        return svg
+
+    def _render_image(self, key:str, data:bytes) -> QImage:
+        """ Clear a template image, render the XML data in place, and return a copy of the result.
+            Use the viewbox dimensions as pixel sizes. This only uses thread-safe paint classes.
+            Templates are reused between renders, so the copy keeps the cached image from aliasing one. """
+        svg = self._parse(key, data)
+        tpl = self._take_template(svg.viewBox().size())
+        tpl.fill(self._bg_color)
+        with QPainter(tpl) as p:
             p.setRenderHints(self._render_hints)
             svg.render(p)
-        return QIcon(QPixmap.fromImage(im))
+        im = tpl.copy()
+        self._put_template(tpl)
+        return im
 
 
 class TreeItem(Generic[TreeItemDataT]):
-    """ A single item in the tree. Contains model data in attributes and role data in the dict. """
+    """ A single item in the tree. Contains model data in attributes and role data in a fixed list of slots. """
 
-    def __init__(self, parent: QModelIndex = QModelIndex()) -> None:
-        self._parent: QModelIndex = parent   # Model index of the direct parent of this item (empty for the root).
-        self._roles: dict[int, Any] = {}     # Contains all display data for this item indexed by Qt roles (really ints).
+    __slots__ = ('_parent', '_row', '_col', '_roles', '_edit_cb', '_delete_cb', '_children', '_rows', '_row_iter',
+                 '_generation')
+
+    def __init__(self, parent: "TreeItem[TreeItemDataT] | None" = None, row=0, col=0) -> None:
+        self._parent = parent                # Item in the direct parent row of this item (None for the root).
+        self._row = row                      # Row number of this item under its parent.
+        self._col = col                      # Column number of this item.
+        self._roles: list[Any] = [*_EMPTY_ROLES]  # Contains all display data for this item indexed by role slot.
         self._edit_cb: Callable[[str], None] | None = None    # Callback to edit the value of this item, or None if not editable.
         self._delete_cb: Callable[[], None] | None = None     # Callback to delete this item, or None if not deletable.
         self._children: Collection[TreeItemDataT] = ()         # Iterable collection that produces child data objects.
+        self._rows: list[list[TreeItem[TreeItemDataT]]] = []  # Grid of child items currently shown under this one.
+        self._row_iter: Iterator[TreeItemDataT] | None = None  # Iterator over child data not yet made into rows, if any.
+        self._generation = 0                 # Number of times this item has been reset for reuse.
+
+    def reset(self) -> None:
+        """ Clear all data from this item so it can be reused. Deferred callbacks made before this will do nothing. """
+        self._parent = None
+        self._roles[:] = _EMPTY_ROLES
+        self._edit_cb = self._delete_cb = None
+        self._children = ()
+        self._rows.clear()
+        self._row_iter = None
+        self._generation += 1
+
+    def place(self, parent: "TreeItem[TreeItemDataT] | None", row: int, col: int) -> None:
+        """ Move a blank item to a new position in the tree. """
+        self._parent = parent
+        self._row = row
+        self._col = col
+
+    def parent(self) -> "TreeItem[TreeItemDataT] | None":
+        """ Return this item's parent item. Used heavily by the Qt item model. """
+        return self._parent
 
-    def role_data(self, role:int) -> Any:
-        """ Return a role data item. Used heavily by the Qt item model. """
-        return self._roles.get(role)
+    def row(self) -> int:
+        """ Return this item's row number under its parent. """
+        return self._row
 
-    def parent(self) -> QModelIndex:
-        """ Return this item's parent index. Used heavily by the Qt item model. """
-        return self._parent
+    def column(self) -> int:
+        """ Return this item's column number. """
+        return self._col
 
     def flags(self) -> Qt.ItemFlag:
         """ Return a set of Qt display flags. Items are black and selectable by default. """
@@ -111,19 +237,34 @@ class TreeItem(Generic[TreeItemDataT]):
 
     def set_text(self, text:str) -> None:
         """ Set the primary text as shown in the tree columns. """
-        self._roles[Qt.ItemDataRole.DisplayRole] = text
+        self._roles[_DISPLAY_SLOT] = text
 
     def set_color(self, r:int, g:int, b:int) -> None:
         """ Set the color of the item's primary text. """
-        self._roles[Qt.ItemDataRole.ForegroundRole] = QColor(r, g, b)
+        key = (r, g, b)
+        color = _COLOR_CACHE.get(key)
+        if color is None:
+            color = _COLOR_CACHE[key] = QColor(r, g, b)
+        self._roles[_FOREGROUND_SLOT] = color
 
     def set_tooltip(self, tooltip:str) -> None:
         """ Set text to appear over the item as a tooltip on mouseover. """
-        self._roles[Qt.ItemDataRole.ToolTipRole] = f'<pre>{tooltip}</pre>'
+        self._roles[_TOOLTIP_SLOT] = tooltip
 
     def set_icon(self, icon:QIcon) -> None:
         """ Set an icon to appear to the left of the item's text. """
-        self._roles[Qt.ItemDataRole.DecorationRole] = icon
+        self._roles[_DECORATION_SLOT] = icon
+
+    def icon_setter(self, on_set: "Callable[[TreeItem[TreeItemDataT]], None] | None" = None) -> Callable[[QIcon], None]:
+        """ Return a callback to set this item's icon later and then call <on_set> with the item (if given).
+            It does nothing if the item is reset before then. """
+        generation = self._generation
+        def set_icon(icon:QIcon) -> None:
+            if self._generation == generation:
+                self.set_icon(icon)
+                if on_set is not None:
+                    on_set(self)
+        return set_icon
 
     def set_edit_cb(self, callback:Callable[[str], None]) -> None:
         """ Set a callback that uses a string to edit the underlying object's value. """
@@ -144,9 +285,15 @@ class TreeColumn(Generic[TreeItemDataT]):
     heading: str  # Heading text that appears above this column.
     width = 0     # Default width (0 if not specified).
 
-    def generate_item(self, data: TreeItemDataT, parent: QModelIndex = QModelIndex()) -> TreeItem[TreeItemDataT]:
-        """ Create and format a tree item from a data structure. """
-        item = TreeItem(parent)
+    def generate_item(self, data: TreeItemDataT, parent: TreeItem[TreeItemDataT] | None = None, row=0, col=0,
+                      pool: list[TreeItem[TreeItemDataT]] | None = None) -> TreeItem[TreeItemDataT]:
+        """ Create and format a tree item at <row>, <col> under <parent> from a data structure.
+            If a <pool> of blank items is given, reuse one of those before creating a new one. """
+        if pool:
+            item = pool.pop()
+            item.place(parent, row, col)
+        else:
+            item = TreeItem(parent, row, col)
         self._format_item(item, data)
         return item
 
@@ -160,42 +307,133 @@ class TreeItemModel(QAbstractItemModel, Generic[TreeItemDataT]):
 
     _ROOT_IDX = QModelIndex()  # Sentinel value for the index of the root item.
 
-    def __init__(self, root_item: TreeItem[TreeItemDataT], columns: Sequence[TreeColumn[TreeItemDataT]], *, child_limit=200, header_height=25) -> None:
+    def __init__(self, root_item: TreeItem[TreeItemDataT], columns: Sequence[TreeColumn[TreeItemDataT]], *, child_limit=200, batch_size=32, header_height=25,
+                 index_cache_size=4096) -> None:
         super().__init__()
-        self._idx_to_item: dict[QModelIndex | QPersistentModelIndex, TreeItem[TreeItemDataT]] = {self._ROOT_IDX: root_item}  # Contains model indices mapped to tree items.
-        self._idx_to_children: DefaultDict[QModelIndex | QPersistentModelIndex, list[list[TreeItem[TreeItemDataT]]]] = defaultdict(list)        # Contains model indices mapped to grids of their children.
+        self._root = root_item                           # Item at the root of the tree. All other items are found through the internal pointers of model indices.
+        self._item_pool: list[TreeItem[TreeItemDataT]] = []  # Blank items left over from removed rows, ready for reuse.
+        self._idx_cache: OrderedDict[tuple[int, int, int], QModelIndex] = OrderedDict()  # LRU cache of recent model indices by parent item ID, row, and column.
+        self._idx_cache_size = index_cache_size          # Maximum number of model indices to keep in the cache.
         self._columns = columns                          # Item formatter for each column in the tree.
         self._child_limit = child_limit                  # Maximum number of child rows to show for each object.
+        self._batch_size = batch_size                    # Number of child rows to add each time the view asks for more.
         self._header_height = header_height              # Height of column headers in pixels.
 
 
     def index(self, row: int, col: int, parent: QPersistentModelIndex | QModelIndex = _ROOT_IDX, *args) -> QModelIndex:
         try:
-            item = self._idx_to_children[parent][row][col]
-            idx = self.createIndex(row, col, item)
-            self._idx_to_item[idx] = item
-            return idx
+            parent_item = parent.internalPointer() or self._root
+            return self._create_index(parent_item, row, col, parent_item._rows[row][col])
         except IndexError:
             return self._ROOT_IDX
 
+    def _create_index(self, parent_item: TreeItem[TreeItemDataT], row: int, col: int, item: TreeItem[TreeItemDataT]) -> QModelIndex:
+        """ Return a model index for <item> at <row>, <col> under <parent_item>, reusing a recent one if possible.
+            Items are recycled, so a cached index only counts if it still points to the same item. """
+        if not self._idx_cache_size:
+            return self.createIndex(row, col, item)
+        key = (id(parent_item), row, col)
+        cache = self._idx_cache
+        idx = cache.get(key)
+        if idx is not None:
+            cache.move_to_end(key)
+            if idx.internalPointer() is not item:
+                idx = cache[key] = self.createIndex(row, col, item)
+            return idx
+        idx = cache[key] = self.createIndex(row, col, item)
+        if len(cache) > self._idx_cache_size:
+            cache.popitem(last=False)
+        return idx
+
+    def _item(self, idx: QPersistentModelIndex | QModelIndex) -> TreeItem[TreeItemDataT]:
+        """ Return the tree item at <idx>. Only the root index has no item pointer. """
+        return idx.internalPointer() or self._root
+
+    def _item_index(self, item: TreeItem[TreeItemDataT] | None) -> QModelIndex:
+        """ Create a model index for <item> from its stored position. The root (or no item) has the root index. """
+        if item is None or item is self._root:
+            return self._ROOT_IDX
+        return self._create_index(item.parent(), item.row(), item.column(), item)
+
     def data(self, idx: QPersistentModelIndex | QModelIndex, role: int = int(Qt.ItemDataRole.DisplayRole)) -> Any:
-        return self._idx_to_item[idx].role_data(role)
+        """ Return an item's role data straight from its slot. This is called for every role of every visible cell.
+            Most roles Qt asks for have no slot, so return those before even touching the index.
+            Tooltips are only asked for on mouseover, so they are stored raw and formatted here. """
+        slot = _ROLE_SLOT.get(role)
+        if slot is None:
+            return None
+        value = (idx.internalPointer() or self._root)._roles[slot]
+        if slot == _TOOLTIP_SLOT and value is not None:
+            return f'<pre>{value}</pre>'
+        return value
 
     def parent(self, idx: QPersistentModelIndex | QModelIndex) -> QModelIndex:  # type: ignore[override]
-        return self._idx_to_item[idx].parent()
+        return self._item_index((idx.internalPointer() or self._root).parent())
 
     def flags(self, idx: QPersistentModelIndex | QModelIndex) -> Qt.ItemFlag:
-        return self._idx_to_item[idx].flags()
+        return (idx.internalPointer() or self._root).flags()
 
     def hasChildren(self, parent: QPersistentModelIndex | QModelIndex = _ROOT_IDX) -> bool:
-        return self._idx_to_item[parent].has_children()
+        return (parent.internalPointer() or self._root).has_children()
 
     def rowCount(self, parent: QPersistentModelIndex | QModelIndex = _ROOT_IDX) -> int:
-        return len(self._idx_to_children[parent])
+        return len((parent.internalPointer() or self._root)._rows)
+
+    def canFetchMore(self, parent: QPersistentModelIndex | QModelIndex = _ROOT_IDX) -> bool:
+        return (parent.internalPointer() or self._root)._row_iter is not None
+
+    def fetchMore(self, parent: QPersistentModelIndex | QModelIndex = _ROOT_IDX) -> None:
+        """ Create, format, and add the next batch of child rows from the parent's data iterator. """
+        self._fetch(parent, self._batch_size)
+
+    def _fetch(self, parent: QPersistentModelIndex | QModelIndex, count: int) -> None:
+        """ Create, format, and add up to <count> more child rows from the parent's data iterator. """
+        parent_item = self._item(parent)
+        child_data, data_iter = self._take_batch(parent_item, count)
+        if child_data:
+            start = len(parent_item._rows)
+            self.beginInsertRows(parent, start, start + len(child_data) - 1)
+            self._add_rows(parent_item, child_data)
+            self.endInsertRows()
+        parent_item._row_iter = data_iter
+
+    def _take_batch(self, parent_item: TreeItem[TreeItemDataT], count: int) -> tuple[list[TreeItemDataT], Iterator[TreeItemDataT] | None]:
+        """ Take up to <count> more child data objects (within the row limit) from the parent item's iterator.
+            Return them with the iterator, or None instead if it ran out of data or the row limit is reached.
+            The iterator is detached from the item in the meantime. Views may call fetchMore again while rows
+            are being inserted, and that must not take data out of order; the caller puts the iterator back. """
+        data_iter = parent_item._row_iter
+        if data_iter is None:
+            return [], None
+        parent_item._row_iter = None
+        start = len(parent_item._rows)
+        count = min(count, self._child_limit - start)
+        child_data = list(islice(data_iter, count))
+        if len(child_data) < count or start + count >= self._child_limit:
+            data_iter = None
+        return child_data, data_iter
+
+    def _add_rows(self, parent_item: TreeItem[TreeItemDataT], child_data: list[TreeItemDataT]) -> None:
+        """ Create, format, and append rows of child items to the parent item from the data.
+            The caller is responsible for notifying views. """
+        # This loop makes every item in the batch. Keep attribute lookups out of it.
+        child_rows = parent_item._rows
+        cols = self._columns
+        ncols = len(cols)
+        pool = self._item_pool
+        for r, data in enumerate(child_data, len(child_rows)):
+            row = [None] * ncols
+            for c in range(ncols):
+                row[c] = cols[c].generate_item(data, parent_item, r, c, pool)
+            child_rows.append(row)
 
     def columnCount(self, parent: QPersistentModelIndex | QModelIndex = _ROOT_IDX) -> int:
         return len(self._columns)
 
+    def column_widths(self) -> list[int]:
+        """ Return the default width of each column in pixels (0 if not specified). """
+        return [col.width for col in self._columns]
+
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = int(Qt.ItemDataRole.DisplayRole)) -> Any:
         """ Return captions or height for the header at the top of the window (or None for other roles). """
         if orientation == Qt.Orientation.Horizontal:
@@ -209,29 +447,55 @@ class TreeItemModel(QAbstractItemModel, Generic[TreeItemDataT]):
         # A blank field will not evaluate to anything; the user just clicked off of the field.
         if not new_value:
             return False
-        item = self._idx_to_item[idx]
+        item = self._item(idx)
         if item.edit(str(new_value)):
-            self.expand(item.parent())
+            self.expand(self._item_index(item.parent()), keep_loaded=True)
         # Either the value or the color will change, and either will affect the display, so return True.
         return True
 
-    def expand(self, idx:QModelIndex=_ROOT_IDX) -> None:
-        """ Add (or replace) all child rows on the item found at <idx> from its object data. """
-        child_rows = self._idx_to_children[idx]
+    def refresh_icon(self, item: TreeItem[TreeItemDataT]) -> None:
+        """ Notify views that the icon on <item> has changed. The root item is never shown. """
+        idx = self._item_index(item)
+        if idx.isValid():
+            self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DecorationRole])
+
+    def _release_rows(self, item: TreeItem[TreeItemDataT]) -> None:
+        """ Drop all child rows under <item> and their descendants, returning their items to the pool. """
+        for row in item._rows:
+            for child in row:
+                self._release_rows(child)
+                child.reset()
+                self._item_pool.append(child)
+        item._rows.clear()
+        item._row_iter = None
+
+    def expand(self, idx:QModelIndex=_ROOT_IDX, *, keep_loaded=False) -> None:
+        """ Replace all child rows on the item found at <idx> and start adding new ones from its object data.
+            If <keep_loaded> is True (as after an edit), show at least as many rows as before so the view keeps its place. """
+        item = self._item(idx)
+        count = self._batch_size
+        if keep_loaded:
+            count = max(count, len(item._rows))
+        if item is self._root:
+            # Replacing the top level rows replaces every row in the tree.
+            # Views handle one reset better than a removal of everything followed by an insertion.
+            self.beginResetModel()
+            self._release_rows(item)
+            item._row_iter = iter(item)
+            child_data, item._row_iter = self._take_batch(item, count)
+            self._add_rows(item, child_data)
+            self.endResetModel()
+            return
+        child_rows = item._rows
         if child_rows:
             # If there are existing child rows, get rid of them first.
-            self.beginRemoveRows(idx, 0, len(child_rows))
-            child_rows.clear()
+            self.beginRemoveRows(idx, 0, len(child_rows) - 1)
+            self._release_rows(item)
             self.endRemoveRows()
-        # Generate child data objects by iterating over the parent item up to a limit using islice.
-        item = self._idx_to_item[idx]
-        child_data = list(islice(item, self._child_limit))
-        # Create, format, and add new rows of child items to the tree from the data.
-        self.beginInsertRows(idx, 0, len(child_data))
-        for data in child_data:
-            row = [col.generate_item(data, idx) for col in self._columns]
-            child_rows.append(row)
-        self.endInsertRows()
+        # Start a new iterator over the parent item's child data and show the first rows.
+        # The view will ask for the rest (up to the limit) as it needs them.
+        item._row_iter = iter(item)
+        self._fetch(idx, count)
 
 
 class TreeDialog(QDialog):
@@ -246,6 +510,9 @@ class TreeDialog(QDialog):
         self._w_view = w_view = QTreeView(self)
         w_view.setFont(QFont("Segoe UI", 9))
         w_view.setUniformRowHeights(True)
+        # Expansion should only lay out new rows once: no animation, and no expanding when double-clicking to edit.
+        w_view.setAnimated(False)
+        w_view.setExpandsOnDoubleClick(False)
         layout = QVBoxLayout(self)
         layout.addWidget(w_view)
 
@@ -255,8 +522,6 @@ class TreeDialog(QDialog):
         self._w_view.setModel(item_model)
         self._w_view.expanded.connect(item_model.expand)
         header = self._w_view.header()
-        for i in range(header.count()):
-            size_hint = item_model.headerData(i, Qt.Orientation.Horizontal, Qt.ItemDataRole.SizeHintRole)
-            width = size_hint.width()
+        for i, width in enumerate(item_model.column_widths()):
             if width:
                 header.resizeSection(i, width)
@@ -1,6 +1,6 @@
-from PySide6.QtCore import Signal, QEvent, QObject
-from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtCore import Qt, Signal, QEvent, QObject, QThreadPool
+from PySide6.QtGui import QIcon, QImage, QPixmap
+from PySide6.QtWidgets import QMainWindow
 
 
 class WindowController(QObject):
@@ -8,33 +8,46 @@ class WindowController(QObject):
 
     activated = Signal()  # Emitted when the window state changes from inactive to active.
 
-    def __init__(self, w_window:QMainWindow) -> None:
-        super().__init__(w_window)
-        self._w_window = w_window  # Main Qt window.
-        w_window.installEventFilter(self)
+    _sig_icon_decoded = Signal(QImage)  # Sent from a pool thread with a decoded window icon image.
 
-    def eventFilter(self, _, event:QEvent) -> bool:
-        if event.type() == QEvent.Type.WindowActivate:
-            self.activated.emit()
-        return False
+    def __init__(self, w_window:QMainWindow, *, async_icon_size=65536) -> None:
+        super().__init__(w_window)
+        self._w_window = w_window                # Main Qt window.
+        self._async_icon_size = async_icon_size  # Icon data at least this many bytes long is decoded on the thread pool.
+        self._sig_icon_decoded.connect(self._apply_icon, Qt.ConnectionType.QueuedConnection)
+        # An event filter would send every event on the window through Python just to find activations.
+        # The window's changeEvent handler only runs for state changes, so hook that instead.
+        base_change_event = w_window.changeEvent
+        def changeEvent(event:QEvent) -> None:
+            base_change_event(event)
+            if event.type() == QEvent.Type.ActivationChange and w_window.isActiveWindow():
+                self.activated.emit()
+        w_window.changeEvent = changeEvent
 
     def show(self) -> None:
         """ Show the window, move it in front of other windows, and activate focus.
-            These events should be explicitly processed before another thread can take the GIL. """
+            The window should be painted before another thread can take the GIL, but pumping the event loop here
+            would dispatch unrelated queued events too, so only repaint it. Activation itself happens later;
+            callers that need the focus should connect to the <activated> signal. """
         self._w_window.show()
         self._w_window.activateWindow()
         self._w_window.raise_()
-        QApplication.processEvents()
+        self._w_window.repaint()
 
     def close(self) -> None:
         self._w_window.close()
 
     def set_icon(self, data:bytes) -> None:
         """ Set the main window icon from a raw bytes object containing an image in some standard format.
-            PNG and SVG formats are known to work. """
-        pixmap = QPixmap()
-        pixmap.loadFromData(data)
-        icon = QIcon(pixmap)
+            PNG and SVG formats are known to work. Large images are decoded on the thread pool and applied later. """
+        if len(data) < self._async_icon_size:
+            self._apply_icon(QImage.fromData(data))
+        else:
+            QThreadPool.globalInstance().start(lambda: self._sig_icon_decoded.emit(QImage.fromData(data)))
+
+    def _apply_icon(self, im:QImage) -> None:
+        """ Convert a decoded image to an icon for the main window. QPixmap may only be used on the GUI thread. """
+        icon = QIcon(QPixmap.fromImage(im))
         self._w_window.setWindowIcon(icon)
 
     def has_focus(self) -> bool: